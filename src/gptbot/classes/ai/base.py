@@ -1,18 +1,13 @@
 from ...classes.logging import Logger
 
 import asyncio
+import random
 from functools import partial
 from typing import Any, AsyncGenerator, Dict, Optional, Mapping
 
 from nio import Event
 
 
-class AttributeDictionary(dict):
-    def __init__(self, *args, **kwargs):
-        super(AttributeDictionary, self).__init__(*args, **kwargs)
-        self.__dict__ = self
-
-
 class BaseAI:
     bot: Any
     logger: Logger
@@ -49,15 +44,33 @@ class BaseAI:
             "Implementations of BaseAI must implement prepare_messages."
         )
 
+    def _is_retryable_error(self, error: Exception) -> bool:
+        """Check whether a failed request is worth retrying.
+
+        Subclasses can override this to filter out errors that will fail again
+        no matter how often they are retried (e.g. authentication errors).
+
+        Args:
+            error (Exception): The error the request failed with.
+
+        Returns:
+            bool: Whether the request should be retried. Defaults to True.
+        """
+
+        return True
+
     async def _request_with_retries(
         self, request: partial, attempts: int = 5, retry_interval: int = 2
     ) -> AsyncGenerator[Any | list | Dict, None]:
         """Retry a request a set number of times if it fails.
 
+        Retries use exponential backoff with jitter so concurrent requests
+        don't all hammer the API again at the same moment.
+
         Args:
             request (partial): The request to make with retries.
             attempts (int, optional): The number of attempts to make. Defaults to 5.
-            retry_interval (int, optional): The interval in seconds between attempts. Defaults to 2 seconds.
+            retry_interval (int, optional): The base interval in seconds between attempts. Defaults to 2 seconds.
 
         Returns:
             AsyncGenerator[Any | list | Dict, None]: The response for the request.
@@ -68,9 +81,14 @@ class BaseAI:
                 response = await request()
                 return response
             except Exception as e:
+                if not self._is_retryable_error(e):
+                    self.logger.log(f"Request failed and cannot be retried: {e}", "error")
+                    raise
+
+                delay = min(retry_interval * (2 ** (current_attempt - 1)), 60) + random.random()
                 self.logger.log(f"Request failed: {e}", "error")
-                self.logger.log(f"Retrying in {retry_interval} seconds...")
-                await asyncio.sleep(retry_interval)
+                self.logger.log(f"Retrying in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
                 current_attempt += 1
 
         raise Exception("Request failed after all attempts.")
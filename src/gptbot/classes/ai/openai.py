@@ -1,16 +1,14 @@
 import openai
-import requests
-import tiktoken
 
+import asyncio
 import base64
 import json
-import inspect
 
-from functools import partial
+from functools import partial, lru_cache
+from types import SimpleNamespace
 from typing import Dict, List, Tuple, Generator, Optional, Mapping, Any
 from io import BytesIO
 
-from pydub import AudioSegment
 from PIL import Image
 from nio import (
     RoomMessageNotice,
@@ -24,7 +22,22 @@ from nio import (
 from ..logging import Logger
 from ...tools import TOOLS, Handover, StopProcessing
 from ..exceptions import DownloadException
-from .base import BaseAI, AttributeDictionary
+from .base import BaseAI
+
+# orjson is considerably faster than the stdlib json module, but the bot works
+# fine without it
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj).decode("utf-8")
+
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 ASSISTANT_CODE_INTERPRETER = [
     {
@@ -33,6 +46,202 @@ ASSISTANT_CODE_INTERPRETER = [
 ]
 
 
+@lru_cache(maxsize=32)
+def _is_tool_model(model: str) -> bool:
+    return model in ("gpt-3.5-turbo", "gpt-4-turbo", "gpt-4o")
+
+
+@lru_cache(maxsize=32)
+def _is_vision_model(model: str) -> bool:
+    return model in ("gpt-4-turbo", "gpt-4o") or "vision" in model
+
+
+def _strip_non_text(messages: List[Any]) -> List[Any]:
+    """Filter list-typed message content down to its text parts.
+
+    Used when rerouting a request to a text-only tool model. Returns a new
+    list with copied dicts so the caller's messages are not mutated; messages
+    left with no text content are dropped.
+
+    Args:
+        messages (List[Any]): The messages to filter.
+
+    Returns:
+        List[Any]: The filtered messages.
+    """
+
+    out_messages = []
+
+    for message in messages:
+        # Only list-typed content needs filtering; strings pass through, as
+        # does the None content of assistant tool-call messages
+        if isinstance(message, dict) and isinstance(message.get("content"), list):
+            message_content = [
+                content for content in message["content"] if content["type"] == "text"
+            ]
+
+            if not message_content:
+                continue
+
+            message = dict(message)
+            message["content"] = message_content
+
+        out_messages.append(message)
+
+    return out_messages
+
+
+def _demote_tool_messages(messages: List[Any]) -> List[Any]:
+    """Rewrite tool responses as system messages.
+
+    Used when falling back to a model (or mode) without tool support. Returns
+    a new list with copied dicts so the caller's messages are not mutated;
+    non-dict entries (e.g. SDK message objects) are dropped.
+
+    Args:
+        messages (List[Any]): The messages to rewrite.
+
+    Returns:
+        List[Any]: The rewritten messages.
+    """
+
+    new_messages = []
+
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+
+        if message["role"] == "tool":
+            message = dict(message)
+            message["role"] = "system"
+            del message["tool_call_id"]
+
+        elif message.get("tool_calls"):
+            # The matching tool responses become system messages above, so
+            # a dangling tool_calls entry would be rejected by the API
+            if not message.get("content"):
+                continue
+
+            message = dict(message)
+            del message["tool_calls"]
+
+        new_messages.append(message)
+
+    return new_messages
+
+
+@lru_cache(maxsize=1)
+def _get_http_client():
+    """Get the shared httpx client used by all AsyncOpenAI instances.
+
+    Sharing one client means all OpenAI requests draw from the same
+    connection pool, amortizing TCP/TLS handshakes across calls instead of
+    every client instance maintaining its own pool.
+
+    Returns:
+        httpx.AsyncClient: The shared HTTP client.
+    """
+
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model.
+
+    Building an encoding is expensive (tens of milliseconds), so the result is
+    cached per model.
+
+    Args:
+        model (str): The model to get the encoding for.
+
+    Returns:
+        tiktoken.Encoding: The encoding for the model.
+    """
+
+    # Only imported when needed, as it is rather expensive to load
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        # TODO: Handle this more gracefully
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+
+
+# The tool schema and the tool emulation prompt are fixed for the lifetime of
+# the process, so they are built once at import time
+
+TOOLS_SCHEMA = [
+    {
+        "type": "function",
+        "function": {
+            "name": tool_name,
+            "description": tool_class.DESCRIPTION,
+            "parameters": tool_class.PARAMETERS,
+        },
+    }
+    for tool_name, tool_class in TOOLS.items()
+]
+
+TOOL_EMULATION_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are a tool dispatcher for an AI chat model. You decide which tools to use for the current conversation. You DO NOT RESPOND DIRECTLY TO THE USER. Instead, respond with a JSON object like this:
+
+                    { "type": "tool", "tool": tool_name, "parameters": { "name": "value"  } }
+
+                    - tool_name is the name of the tool you want to use.
+                    - parameters is an object containing the parameters for the tool. The parameters are defined in the tool's description.
+
+                    The following tools are available:
+
+                    """
+    + "\n".join(
+        [
+            f"- {tool_name}: {tool_class.DESCRIPTION} ({tool_class.PARAMETERS})"
+            for tool_name, tool_class in TOOLS.items()
+        ]
+    )
+    + """
+
+                        If no tool is required, or all information is already available in the message thread, respond with an empty JSON object: {}
+
+                        Otherwise, respond with a single required tool call. Remember that you DO NOT RESPOND to the user. You MAY ONLY RESPOND WITH JSON OBJECTS CONTAINING TOOL CALLS! DO NOT RESPOND IN NATURAL LANGUAGE.
+
+                        DO NOT include any other text or syntax in your response, only the JSON object. DO NOT surround it in code tags (```). DO NOT, UNDER ANY CIRCUMSTANCES, ASK AGAIN FOR INFORMATION ALREADY PROVIDED IN THE MESSAGES YOU RECEIVED! DO NOT REQUEST MORE INFORMATION THAN ABSOLUTELY REQUIRED TO RESPOND TO THE USER'S MESSAGE! Remind the user that they may ask you to search for additional information if they need it.
+                        """,
+}
+
+CLASSIFIER_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You are a classifier for different types of messages. You decide whether an incoming message is meant to be a prompt for an AI chat model, or meant for a different API. You respond with a JSON object like this:
+
+{ "type": event_type, "prompt": prompt }
+
+- If the message you received is meant for the AI chat model, the event_type is "chat", and the prompt is the literal content of the message you received. This is also the default if none of the other options apply.
+- If it is a prompt for a calculation that can be answered better by WolframAlpha than an AI chat bot, the event_type is "calculate". Optimize the message you received for input to WolframAlpha, and return it as the prompt attribute.
+- If it is a prompt for an AI image generation, the event_type is "imagine". Optimize the message you received for use with DALL-E, and return it as the prompt attribute.
+- If the user is asking you to create a new room, the event_type is "newroom", and the prompt is the name of the room, if one is given, else an empty string.
+- If the user is asking you to throw a coin, the event_type is "coin". The prompt is an empty string.
+- If the user is asking you to roll a dice, the event_type is "dice". The prompt is an string containing an optional number of sides, if one is given, else an empty string.
+- If for any reason you are unable to classify the message (for example, if it infringes on your terms of service), the event_type is "error", and the prompt is a message explaining why you are unable to process the message.
+
+Only the event_types mentioned above are allowed, you must not respond in any other way.""",
+}
+
+BATCH_CLASSIFIER_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": CLASSIFIER_SYSTEM_MESSAGE["content"]
+    + """
+
+You will receive several messages at once, one per line, each prefixed with its number like "1. message". Respond with a JSON array containing one object as described above for each message, in the same order.""",
+}
+
+
 class OpenAI(BaseAI):
     api_code: str = "openai"
 
@@ -52,9 +261,24 @@ class OpenAI(BaseAI):
     ):
         super().__init__(bot, config, logger)
         self.openai_api = openai.AsyncOpenAI(
-            api_key=self.api_key, base_url=self.base_url
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=self.request_timeout,
+            max_retries=0,  # Retries are handled by _request_with_retries
+            http_client=_get_http_client(),
         )
 
+        # Created on first use when a model override requires talking to the
+        # official OpenAI endpoint instead of the configured BaseURL
+        self._openai_com_fallback: Optional[openai.AsyncOpenAI] = None
+
+        # These options are read on every iteration of the chat loop, so
+        # parse them once at startup instead of going through configparser
+        # each time
+        self._force_tools = self._config.getboolean("ForceTools", fallback=False)
+        self._emulate_tools = self._config.getboolean("EmulateTools", fallback=False)
+        self._max_tokens = self._config.getint("MaxTokens", fallback=4000)
+
     # TODO: Add descriptions for these properties
 
     @property
@@ -85,6 +309,10 @@ class OpenAI(BaseAI):
     def base_url(self):
         return self._config.get("BaseURL", fallback="https://api.openai.com/v1/")
 
+    @property
+    def request_timeout(self):
+        return self._config.getfloat("RequestTimeout", fallback=120.0)
+
     @property
     def temperature(self):
         return self._config.getfloat("Temperature", fallback=1.0)
@@ -111,7 +339,7 @@ class OpenAI(BaseAI):
 
     @property
     def force_tools(self):
-        return self._config.getboolean("ForceTools", fallback=False)
+        return self._force_tools
 
     @property
     def tool_model(self):
@@ -123,12 +351,12 @@ class OpenAI(BaseAI):
 
     @property
     def emulate_tools(self):
-        return self._config.getboolean("EmulateTools", fallback=False)
+        return self._emulate_tools
 
     @property
     def max_tokens(self):
         # TODO: This should be model-specific
-        return self._config.getint("MaxTokens", fallback=4000)
+        return self._max_tokens
 
     @property
     def max_messages(self):
@@ -142,11 +370,25 @@ class OpenAI(BaseAI):
     def max_image_short_side(self):
         return self._config.getint("MaxImageShortSide", fallback=768)
 
+    def _is_retryable_error(self, error: Exception) -> bool:
+        # Rate limits, connection problems, timeouts and server-side errors
+        # are transient - everything else (e.g. auth errors, bad requests)
+        # will fail again on retry
+        return isinstance(
+            error,
+            (
+                openai.RateLimitError,
+                openai.APIConnectionError,
+                openai.APITimeoutError,
+                openai.InternalServerError,
+            ),
+        ) or not isinstance(error, openai.APIError)
+
     def _is_tool_model(self, model: str) -> bool:
-        return model in ("gpt-3.5-turbo", "gpt-4-turbo", "gpt-4o")
+        return _is_tool_model(model)
 
     def _is_vision_model(self, model: str) -> bool:
-        return model in ("gpt-4-turbo", "gpt-4o") or "vision" in model
+        return _is_vision_model(model)
 
     def supports_chat_images(self):
         return self._is_vision_model(self.chat_model) or self.force_vision
@@ -155,16 +397,20 @@ class OpenAI(BaseAI):
         return self.force_video_input
 
     def json_decode(self, data):
-        if data.startswith("```json\n"):
-            data = data[8:]
-        elif data.startswith("```\n"):
-            data = data[4:]
+        data = (
+            data.removeprefix("```json\n")
+            .removeprefix("```\n")
+            .removesuffix("```")
+            .strip()
+        )
 
-        if data.endswith("```"):
-            data = data[:-3]
+        # Don't bother the parser with responses that can't possibly be JSON -
+        # plain text replies are by far the most common case here
+        if not data.startswith(("{", "[")):
+            return False
 
         try:
-            return json.loads(data)
+            return _json_loads(data)
         except Exception:
             return False
 
@@ -264,27 +510,36 @@ class OpenAI(BaseAI):
                     download = await self.bot.download_file(image_url, raise_error=True)
 
                     if download:
-                        pil_image = Image.open(BytesIO(download.body))
-
-                        file_format = pil_image.format or "PNG"
+                        image_bytes = download.body
 
                         max_long_side = self.max_image_long_side
                         max_short_side = self.max_image_short_side
 
                         if max_long_side and max_short_side:
-                            if pil_image.width > pil_image.height:
-                                if pil_image.width > max_long_side:
-                                    pil_image.thumbnail((max_long_side, max_short_side))
+                            pil_image = Image.open(BytesIO(image_bytes))
+
+                            file_format = pil_image.format or "PNG"
 
+                            if pil_image.width > pil_image.height:
+                                resize_needed = pil_image.width > max_long_side
+                                thumbnail_size = (max_long_side, max_short_side)
                             else:
-                                if pil_image.height > max_long_side:
-                                    pil_image.thumbnail((max_short_side, max_long_side))
+                                resize_needed = pil_image.height > max_long_side
+                                thumbnail_size = (max_short_side, max_long_side)
+
+                            # Only re-encode the image if it actually has to be
+                            # resized - otherwise the downloaded bytes are used
+                            # as-is
+                            if resize_needed:
+                                pil_image.thumbnail(thumbnail_size)
 
-                        bio = BytesIO()
+                                bio = BytesIO()
 
-                        pil_image.save(bio, format=file_format)
+                                pil_image.save(bio, format=file_format)
 
-                        encoded_url = f"data:{download.content_type};base64,{base64.b64encode(bio.getvalue()).decode('utf-8')}"
+                                image_bytes = bio.getvalue()
+
+                        encoded_url = f"data:{download.content_type};base64,{base64.b64encode(image_bytes).decode('utf-8')}"
                         parent = (
                             chat_messages[-1]
                             if chat_messages
@@ -426,11 +681,7 @@ class OpenAI(BaseAI):
             else system_message
         )
 
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except Exception:
-            # TODO: Handle this more gracefully
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        encoding = _get_encoding(model)
 
         total_tokens = 0
 
@@ -494,164 +745,193 @@ class OpenAI(BaseAI):
             f"Generating response to {len(messages)} messages for user {user} in room {room}..."
         )
 
-        original_model = chat_model = model or self.chat_model
+        original_model = model or self.chat_model
 
-        # Check current recursion depth to prevent infinite loops
+        total_tokens = 0
+        iterations = 0
+        max_tokens_fallbacks = 0
 
-        if use_tools:
-            frames = inspect.stack()
-            current_function = inspect.getframeinfo(frames[0][0]).function
-            count = sum(
-                1
-                for frame in frames
-                if inspect.getframeinfo(frame[0]).function == current_function
-            )
-            self.logger.log(
-                f"{current_function} appears {count} times in the call stack"
-            )
+        while True:
+            iterations += 1
+
+            # Limit the number of tool iterations to prevent infinite loops
 
-            if count > 5:
+            if use_tools and iterations > 5:
                 self.logger.log("Recursion depth exceeded, aborting.")
-                return await self.generate_chat_response(
-                    messages=messages,
-                    user=user,
-                    room=room,
-                    allow_override=False,  # TODO: Could this be a problem?
-                    use_tools=False,
-                    model=original_model,
-                )
+                use_tools = False
+                allow_override = False  # TODO: Could this be a problem?
+
+            chat_model = original_model
+            original_messages = messages
+            request_messages = messages
+
+            if (
+                allow_override
+                and use_tools
+                and self.tool_model
+                and not (self._is_tool_model(chat_model) or self.force_tools)
+            ):
+                self.logger.log("Overriding chat model to use tools")
+                chat_model = self.tool_model
+                request_messages = _strip_non_text(request_messages)
+
+            self.logger.log(f"Generating response with model {chat_model}...")
 
-        tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool_name,
-                    "description": tool_class.DESCRIPTION,
-                    "parameters": tool_class.PARAMETERS,
-                },
+            if (
+                use_tools
+                and self.emulate_tools
+                and not self.force_tools
+                and not self._is_tool_model(chat_model)
+            ):
+                self.bot.logger.log("Using tool emulation mode.", "debug")
+
+                request_messages = [TOOL_EMULATION_SYSTEM_MESSAGE] + request_messages
+
+            kwargs = {
+                "model": chat_model,
+                "messages": request_messages,
+                "user": room,
+                "temperature": self.temperature,
+                "top_p": self.top_p,
+                "frequency_penalty": self.frequency_penalty,
+                "presence_penalty": self.presence_penalty,
+                "stream": True,
+                "stream_options": {"include_usage": True},
             }
-            for tool_name, tool_class in TOOLS.items()
-        ]
 
-        original_messages = messages
+            if (self._is_tool_model(chat_model) and use_tools) or self.force_tools:
+                kwargs["tools"] = TOOLS_SCHEMA
 
-        if (
-            allow_override
-            and use_tools
-            and self.tool_model
-            and not (self._is_tool_model(chat_model) or self.force_tools)
-        ):
-            if self.tool_model:
-                self.logger.log("Overriding chat model to use tools")
-                chat_model = self.tool_model
+            # TODO: Look into this
+            if "gpt-4" in chat_model:
+                kwargs["max_tokens"] = self.max_tokens
 
-                out_messages = []
-
-                for message in messages:
-                    if isinstance(message, dict):
-                        if isinstance(message["content"], str):
-                            out_messages.append(message)
-                        else:
-                            message_content = []
-                            for content in message["content"]:
-                                if content["type"] == "text":
-                                    message_content.append(content)
-                            if message_content:
-                                message["content"] = message_content
-                                out_messages.append(message)
-                    else:
-                        out_messages.append(message)
+            client = self.openai_api
 
-                messages = out_messages
+            if (
+                chat_model.startswith("gpt-")
+                and not self.chat_model.startswith("gpt-")
+                and self.api_key.startswith("sk-")
+            ):
+                # The model is overridden, we have to ensure that OpenAI is
+                # used - a separate client avoids mutating the shared one,
+                # which wouldn't be safe with concurrent requests
+                if self._openai_com_fallback is None:
+                    self._openai_com_fallback = openai.AsyncOpenAI(
+                        api_key=self.api_key,
+                        base_url="https://api.openai.com/v1/",
+                        timeout=self.request_timeout,
+                        max_retries=0,  # Retries are handled by _request_with_retries
+                        http_client=_get_http_client(),
+                    )
 
-        self.logger.log(f"Generating response with model {chat_model}...")
+                client = self._openai_com_fallback
 
-        if (
-            use_tools
-            and self.emulate_tools
-            and not self.force_tools
-            and not self._is_tool_model(chat_model)
-        ):
-            self.bot.logger.log("Using tool emulation mode.", "debug")
+            chat_partial = partial(client.chat.completions.create, **kwargs)
 
-            messages = (
-                [
-                    {
-                        "role": "system",
-                        "content": """You are a tool dispatcher for an AI chat model. You decide which tools to use for the current conversation. You DO NOT RESPOND DIRECTLY TO THE USER. Instead, respond with a JSON object like this:
+            async def chat_and_consume():
+                # Consume the stream as it arrives, accumulating the response
+                # text and any tool calls from the deltas. Transient errors
+                # can also surface mid-stream, after create() has returned,
+                # so consumption happens inside the retried request and
+                # restarts from scratch on failure.
+                response_stream = await chat_partial()
 
-                    { "type": "tool", "tool": tool_name, "parameters": { "name": "value"  } }
+                result_parts = []
+                tool_calls = []
+                stream_tokens = 0
 
-                    - tool_name is the name of the tool you want to use.
-                    - parameters is an object containing the parameters for the tool. The parameters are defined in the tool's description.
+                async for chunk in response_stream:
+                    if getattr(chunk, "usage", None):
+                        stream_tokens += chunk.usage.total_tokens
 
-                    The following tools are available:
+                    if not chunk.choices:
+                        continue
 
-                    """
-                        + "\n".join(
-                            [
-                                f"- {tool_name}: {tool_class.DESCRIPTION} ({tool_class.PARAMETERS})"
-                                for tool_name, tool_class in TOOLS.items()
-                            ]
-                        )
-                        + """
+                    delta = chunk.choices[0].delta
 
-                        If no tool is required, or all information is already available in the message thread, respond with an empty JSON object: {}
+                    if not delta:
+                        continue
 
-                        Otherwise, respond with a single required tool call. Remember that you DO NOT RESPOND to the user. You MAY ONLY RESPOND WITH JSON OBJECTS CONTAINING TOOL CALLS! DO NOT RESPOND IN NATURAL LANGUAGE.
+                    if delta.content:
+                        result_parts.append(delta.content)
 
-                        DO NOT include any other text or syntax in your response, only the JSON object. DO NOT surround it in code tags (```). DO NOT, UNDER ANY CIRCUMSTANCES, ASK AGAIN FOR INFORMATION ALREADY PROVIDED IN THE MESSAGES YOU RECEIVED! DO NOT REQUEST MORE INFORMATION THAN ABSOLUTELY REQUIRED TO RESPOND TO THE USER'S MESSAGE! Remind the user that they may ask you to search for additional information if they need it.
-                        """,
-                    }
-                ]
-                + messages
-            )
+                    for tool_call in delta.tool_calls or []:
+                        while len(tool_calls) <= tool_call.index:
+                            tool_calls.append(
+                                SimpleNamespace(
+                                    id="",
+                                    type="function",
+                                    function=SimpleNamespace(name="", arguments=""),
+                                )
+                            )
 
-        kwargs = {
-            "model": chat_model,
-            "messages": messages,
-            "user": room,
-            "temperature": self.temperature,
-            "top_p": self.top_p,
-            "frequency_penalty": self.frequency_penalty,
-            "presence_penalty": self.presence_penalty,
-        }
+                        current = tool_calls[tool_call.index]
 
-        if (self._is_tool_model(chat_model) and use_tools) or self.force_tools:
-            kwargs["tools"] = tools
+                        if tool_call.id:
+                            current.id = tool_call.id
+                        if tool_call.function:
+                            if tool_call.function.name:
+                                current.function.name = tool_call.function.name
+                            if tool_call.function.arguments:
+                                current.function.arguments += (
+                                    tool_call.function.arguments
+                                )
 
-        # TODO: Look into this
-        if "gpt-4" in chat_model:
-            kwargs["max_tokens"] = self.max_tokens
+                return result_parts, tool_calls, stream_tokens
 
-        api_url = self.base_url
+            try:
+                result_parts, tool_calls, stream_tokens = (
+                    await self._request_with_retries(chat_and_consume)
+                )
+            except openai.APIError as e:
+                if e.code == "max_tokens" and max_tokens_fallbacks < 2:
+                    max_tokens_fallbacks += 1
+                    self.logger.log(
+                        "Max tokens exceeded, falling back to no-tools response."
+                    )
 
-        if chat_model.startswith("gpt-"):
-            if not self.chat_model.startswith("gpt-"):
-                # The model is overridden, we have to ensure that OpenAI is used
-                if self.api_key.startswith("sk-"):
-                    self.openai_api.base_url = "https://api.openai.com/v1/"
+                    use_tools = False
+                    allow_override = False
 
-        chat_partial = partial(self.openai_api.chat.completions.create, **kwargs)
-        response = await self._request_with_retries(chat_partial)
+                    if max_tokens_fallbacks == 1:
+                        messages = _demote_tool_messages(original_messages)
+                    else:
+                        messages = original_messages
 
-        # Setting back the API URL to whatever it was before
-        self.openai_api.base_url = api_url
+                    continue
+                raise e
 
-        choice = response.choices[0]
-        result_text = choice.message.content
+            total_tokens += stream_tokens
+            result_text = "".join(result_parts)
 
-        self.logger.log(f"Generated response: {result_text}")
+            self.logger.log(f"Generated response: {result_text}")
 
-        additional_tokens = 0
+            if (not result_text) and tool_calls:
+                tool_responses = []
+                handover = False
 
-        if (not result_text) and choice.message.tool_calls:
-            tool_responses = []
-            for tool_call in choice.message.tool_calls:
-                try:
-                    tool_response = await self.bot.call_tool(
-                        tool_call, room=room, user=user
-                    )
+                # The tool calls are independent, so they are dispatched
+                # concurrently instead of being awaited one after another
+                results = await asyncio.gather(
+                    *(
+                        self.bot.call_tool(tool_call, room=room, user=user)
+                        for tool_call in tool_calls
+                    ),
+                    return_exceptions=True,
+                )
+
+                stop = None
+
+                for tool_call, tool_response in zip(tool_calls, results):
+                    if isinstance(tool_response, StopProcessing):
+                        stop = tool_response
+                        break
+                    if isinstance(tool_response, Handover):
+                        handover = True
+                        continue
+                    if isinstance(tool_response, BaseException):
+                        raise tool_response
                     if tool_response is not False:
                         tool_responses.append(
                             {
@@ -660,226 +940,122 @@ class OpenAI(BaseAI):
                                 "content": str(tool_response),
                             }
                         )
-                except StopProcessing as e:
-                    return (e.args[0] if e.args else False), 0
-                except Handover:
-                    return await self.generate_chat_response(
-                        messages=original_messages,
-                        user=user,
-                        room=room,
-                        allow_override=False,
-                        use_tools=False,
-                        model=original_model,
-                    )
 
-            if not tool_responses:
-                self.logger.log("No more responses received, aborting.")
-                result_text = False
-            else:
-                try:
-                    messages = (
-                        original_messages[:-1]
-                        + [choice.message]
-                        + tool_responses
-                        + original_messages[-1:]
-                    )
-                    result_text, additional_tokens = await self.generate_chat_response(
-                        messages=messages, user=user, room=room, model=original_model
-                    )
-                except openai.APIError as e:
-                    if e.code == "max_tokens":
-                        self.logger.log(
-                            "Max tokens exceeded, falling back to no-tools response."
-                        )
-                        try:
-                            new_messages = []
-
-                            for message in original_messages:
-                                new_message = message
-
-                                if isinstance(message, dict):
-                                    if message["role"] == "tool":
-                                        new_message["role"] = "system"
-                                        del new_message["tool_call_id"]
-
-                                else:
-                                    continue
-
-                                new_messages.append(new_message)
-
-                            (
-                                result_text,
-                                additional_tokens,
-                            ) = await self.generate_chat_response(
-                                messages=new_messages,
-                                user=user,
-                                room=room,
-                                allow_override=False,
-                                use_tools=False,
-                                model=original_model,
-                            )
+                if stop:
+                    return (stop.args[0] if stop.args else False), total_tokens
 
-                        except openai.APIError as e:
-                            if e.code == "max_tokens":
-                                (
-                                    result_text,
-                                    additional_tokens,
-                                ) = await self.generate_chat_response(
-                                    messages=original_messages,
-                                    user=user,
-                                    room=room,
-                                    allow_override=False,
-                                    use_tools=False,
-                                    model=original_model,
-                                )
-                    else:
-                        raise e
-
-        elif isinstance((tool_object := self.json_decode(result_text)), dict):
-            if "tool" in tool_object:
-                tool_name = tool_object["tool"]
-                tool_parameters = (
-                    tool_object["parameters"] if "parameters" in tool_object else {}
-                )
-
-                self.logger.log(
-                    f"Using tool {tool_name} with parameters {tool_parameters}..."
-                )
+                if handover:
+                    messages = original_messages
+                    allow_override = False
+                    use_tools = False
+                    continue
 
-                tool_call = AttributeDictionary(
-                    {
-                        "function": AttributeDictionary(
+                if not tool_responses:
+                    self.logger.log("No more responses received, aborting.")
+                    result_text = False
+                else:
+                    assistant_message = {
+                        "role": "assistant",
+                        "content": result_text or None,
+                        "tool_calls": [
                             {
-                                "name": tool_name,
-                                "arguments": json.dumps(tool_parameters),
+                                "id": tool_call.id,
+                                "type": "function",
+                                "function": {
+                                    "name": tool_call.function.name,
+                                    "arguments": tool_call.function.arguments,
+                                },
                             }
-                        ),
+                            for tool_call in tool_calls
+                        ],
                     }
-                )
 
-                try:
-                    tool_response = await self.bot.call_tool(
-                        tool_call, room=room, user=user
-                    )
-                    if tool_response is not False:
-                        tool_responses = [
-                            {
-                                "role": "system",
-                                "content": str(tool_response),
-                            }
-                        ]
-                except StopProcessing as e:
-                    return (e.args[0] if e.args else False), 0
-                except Handover:
-                    return await self.generate_chat_response(
-                        messages=original_messages,
-                        user=user,
-                        room=room,
-                        allow_override=False,
-                        use_tools=False,
-                        model=original_model,
-                    )
+                    messages = [
+                        *original_messages[:-1],
+                        assistant_message,
+                        *tool_responses,
+                        original_messages[-1],
+                    ]
+                    continue
 
-                if not tool_responses:
-                    self.logger.log("No response received, aborting.")
-                    result_text = False
-                else:
-                    try:
-                        messages = (
-                            original_messages[:-1]
-                            + [choice.message]
-                            + tool_responses
-                            + original_messages[-1:]
-                        )
-                        (
-                            result_text,
-                            additional_tokens,
-                        ) = await self.generate_chat_response(
-                            messages=messages,
-                            user=user,
-                            room=room,
-                            model=original_model,
-                        )
-                    except openai.APIError as e:
-                        if e.code == "max_tokens":
-                            (
-                                result_text,
-                                additional_tokens,
-                            ) = await self.generate_chat_response(
-                                messages=original_messages,
-                                user=user,
-                                room=room,
-                                allow_override=False,
-                                use_tools=False,
-                                model=original_model,
-                            )
-                        else:
-                            raise e
-            else:
-                result_text, additional_tokens = await self.generate_chat_response(
-                    messages=original_messages,
-                    user=user,
-                    room=room,
-                    allow_override=False,
-                    use_tools=False,
-                    model=original_model,
-                )
+            elif isinstance((tool_object := self.json_decode(result_text)), dict):
+                if "tool" in tool_object:
+                    tool_name = tool_object["tool"]
+                    tool_parameters = (
+                        tool_object["parameters"] if "parameters" in tool_object else {}
+                    )
 
-        elif not original_model == chat_model:
-            new_messages = []
+                    self.logger.log(
+                        f"Using tool {tool_name} with parameters {tool_parameters}..."
+                    )
 
-            for message in original_messages:
-                new_message = message
+                    tool_call = SimpleNamespace(
+                        function=SimpleNamespace(
+                            name=tool_name,
+                            arguments=_json_dumps(tool_parameters),
+                        ),
+                    )
 
-                if isinstance(message, dict):
-                    if message["role"] == "tool":
-                        new_message["role"] = "system"
-                        del new_message["tool_call_id"]
+                    tool_responses = []
+                    handover = False
 
+                    try:
+                        tool_response = await self.bot.call_tool(
+                            tool_call, room=room, user=user
+                        )
+                        if tool_response is not False:
+                            tool_responses = [
+                                {
+                                    "role": "system",
+                                    "content": str(tool_response),
+                                }
+                            ]
+                    except StopProcessing as e:
+                        return (e.args[0] if e.args else False), total_tokens
+                    except Handover:
+                        handover = True
+
+                    if handover:
+                        messages = original_messages
+                        allow_override = False
+                        use_tools = False
+                        continue
+
+                    if not tool_responses:
+                        self.logger.log("No response received, aborting.")
+                        result_text = False
+                    else:
+                        messages = [
+                            *original_messages[:-1],
+                            {"role": "assistant", "content": result_text},
+                            *tool_responses,
+                            original_messages[-1],
+                        ]
+                        continue
                 else:
+                    messages = original_messages
+                    allow_override = False
+                    use_tools = False
                     continue
 
-                new_messages.append(new_message)
+            elif not original_model == chat_model:
+                messages = _demote_tool_messages(original_messages)
+                allow_override = False
+                continue
 
-            result_text, additional_tokens = await self.generate_chat_response(
-                messages=new_messages,
-                user=user,
-                room=room,
-                allow_override=False,
-                model=original_model,
-            )
-
-        if not result_text:
-            self.logger.log(
-                "Received an empty response from the OpenAI endpoint.", "debug"
-            )
-
-        try:
-            tokens_used = response.usage.total_tokens
-        except Exception:
-            tokens_used = 0
+            if not result_text:
+                self.logger.log(
+                    "Received an empty response from the OpenAI endpoint.", "debug"
+                )
 
-        self.logger.log(f"Generated response with {tokens_used} tokens.")
-        return result_text, tokens_used + additional_tokens
+            self.logger.log(f"Generated response with {total_tokens} tokens.")
+            return result_text, total_tokens
 
     async def classify_message(
         self, query: str, user: Optional[str] = None
     ) -> Tuple[Dict[str, str], int]:
-        system_message = """You are a classifier for different types of messages. You decide whether an incoming message is meant to be a prompt for an AI chat model, or meant for a different API. You respond with a JSON object like this:
-
-{ "type": event_type, "prompt": prompt }
-
-- If the message you received is meant for the AI chat model, the event_type is "chat", and the prompt is the literal content of the message you received. This is also the default if none of the other options apply.
-- If it is a prompt for a calculation that can be answered better by WolframAlpha than an AI chat bot, the event_type is "calculate". Optimize the message you received for input to WolframAlpha, and return it as the prompt attribute.
-- If it is a prompt for an AI image generation, the event_type is "imagine". Optimize the message you received for use with DALL-E, and return it as the prompt attribute.
-- If the user is asking you to create a new room, the event_type is "newroom", and the prompt is the name of the room, if one is given, else an empty string.
-- If the user is asking you to throw a coin, the event_type is "coin". The prompt is an empty string.
-- If the user is asking you to roll a dice, the event_type is "dice". The prompt is an string containing an optional number of sides, if one is given, else an empty string.
-- If for any reason you are unable to classify the message (for example, if it infringes on your terms of service), the event_type is "error", and the prompt is a message explaining why you are unable to process the message.
-
-Only the event_types mentioned above are allowed, you must not respond in any other way."""
         messages = [
-            {"role": "system", "content": system_message},
+            CLASSIFIER_SYSTEM_MESSAGE,
             {"role": "user", "content": query},
         ]
 
@@ -894,7 +1070,7 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
         response = await self._request_with_retries(chat_partial)
 
         try:
-            result = json.loads(response.choices[0].message["content"])
+            result = _json_loads(response.choices[0].message["content"])
         except Exception:
             result = {"type": "chat", "prompt": query}
 
@@ -906,6 +1082,63 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
 
         return result, tokens_used
 
+    async def classify_messages(
+        self, queries: List[str], user: Optional[str] = None
+    ) -> Tuple[List[Dict[str, str]], int]:
+        """Classify several messages with a single API request.
+
+        Args:
+            queries (List[str]): The messages to classify.
+            user (Optional[str], optional): The user making the request.
+
+        Returns:
+            Tuple[List[Dict[str, str]], int]: The classification for each
+            query, in order, and the number of tokens used.
+        """
+
+        if len(queries) == 1:
+            result, tokens_used = await self.classify_message(queries[0], user=user)
+            return [result], tokens_used
+
+        content = "\n".join(
+            f"{number}. {query}" for number, query in enumerate(queries, start=1)
+        )
+
+        messages = [
+            BATCH_CLASSIFIER_SYSTEM_MESSAGE,
+            {"role": "user", "content": content},
+        ]
+
+        self.logger.log(f"Classifying {len(queries)} messages in one request...")
+
+        chat_partial = partial(
+            self.openai_api.chat.completions.create,
+            model=self.chat_model,
+            messages=messages,
+            user=str(user),
+        )
+        response = await self._request_with_retries(chat_partial)
+
+        results = None
+
+        try:
+            results = self.json_decode(response.choices[0].message["content"])
+        except Exception:
+            pass
+
+        if not isinstance(results, list) or len(results) != len(queries):
+            # If the model didn't return one object per query, fall back to
+            # treating everything as a chat prompt
+            results = [{"type": "chat", "prompt": query} for query in queries]
+
+        tokens_used = response.usage["total_tokens"]
+
+        self.logger.log(
+            f"Classified {len(queries)} messages with {tokens_used} tokens."
+        )
+
+        return results, tokens_used
+
     async def text_to_speech(
         self, text: str, user: Optional[str] = None
     ) -> Generator[bytes, None, None]:
@@ -927,6 +1160,28 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
 
         return speech.content
 
+    @staticmethod
+    def _convert_to_mp3(audio: bytes) -> BytesIO:
+        """Convert audio data to an in-memory mp3 file.
+
+        This is blocking, CPU-bound work, so callers should run it in an
+        executor rather than directly on the event loop.
+
+        Args:
+            audio (bytes): The audio data.
+
+        Returns:
+            BytesIO: The converted audio file.
+        """
+        # Only imported when needed, as importing pydub probes for ffmpeg
+        from pydub import AudioSegment
+
+        audio_file = BytesIO()
+        AudioSegment.from_file(BytesIO(audio)).export(audio_file, format="mp3")
+        audio_file.name = "audio.mp3"
+
+        return audio_file
+
     async def speech_to_text(
         self, audio: bytes, user: Optional[str] = None
     ) -> Tuple[str, int]:
@@ -940,9 +1195,7 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
         """
         self.logger.log("Generating text from speech...")
 
-        audio_file = BytesIO()
-        AudioSegment.from_file(BytesIO(audio)).export(audio_file, format="mp3")
-        audio_file.name = "audio.mp3"
+        audio_file = await asyncio.to_thread(self._convert_to_mp3, audio)
 
         response = await self.openai_api.audio.transcriptions.create(
             model=self.stt_model,
@@ -970,23 +1223,24 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
         """
         self.logger.log(f"Generating image from prompt '{prompt}'...")
 
-        split_prompt = prompt.split()
-        delete_first = False
-
         size = "1024x1024"
 
         if self.image_model == "dall-e-3":
-            if orientation == "portrait" or (
-                delete_first := split_prompt[0] == "--portrait"
-            ):
-                size = "1024x1792"
-            elif orientation == "landscape" or (
-                delete_first := split_prompt[0] == "--landscape"
+            for flag, flag_size in (
+                ("--portrait", "1024x1792"),
+                ("--landscape", "1792x1024"),
             ):
-                size = "1792x1024"
-
-        if delete_first:
-            prompt = " ".join(split_prompt[1:])
+                # Match the flag as a whole token so prompts that merely
+                # start with it (e.g. "--portraits of ...") pass through
+                if prompt == flag or prompt.startswith(flag + " "):
+                    size = flag_size
+                    prompt = prompt[len(flag) :].lstrip()
+                    break
+            else:
+                if orientation == "portrait":
+                    size = "1024x1792"
+                elif orientation == "landscape":
+                    size = "1792x1024"
 
         self.logger.log(
             f"Generating image with size {size} using model {self.image_model}..."
@@ -1006,11 +1260,15 @@ Only the event_types mentioned above are allowed, you must not respond in any ot
         image_partial = partial(self.openai_api.images.generate, **args)
         response = await self._request_with_retries(image_partial)
 
-        images = []
+        # Download all generated images concurrently through the shared
+        # HTTP client instead of blocking the event loop on each one
+        http_client = _get_http_client()
+
+        downloads = await asyncio.gather(
+            *(http_client.get(image.url) for image in response.data)
+        )
 
-        for image in response.data:
-            image = requests.get(image.url).content
-            images.append(image)
+        images = [download.content for download in downloads]
 
         return images, len(images)
 
@@ -1,7 +1,24 @@
+import aiohttp
 import markdown2
-import tiktoken
 import asyncio
 
+# aiodns lets the shared connector resolve DNS on the event loop instead
+# of in the default thread pool; the bot works fine without it
+try:
+    import aiodns  # noqa: F401
+
+    _HAVE_AIODNS = True
+except ImportError:
+    _HAVE_AIODNS = False
+
+# Only advertise brotli to servers if we can actually decompress it
+try:
+    import brotli  # noqa: F401
+
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
 from PIL import Image
 
 from nio import (
@@ -33,7 +50,7 @@ from nio import (
 from nio.store import SqliteStore
 
 
-from typing import Optional, List, Any, Union
+from typing import Dict, Optional, List, Any, Tuple, Union
 from configparser import ConfigParser
 from datetime import datetime
 from io import BytesIO
@@ -69,6 +86,13 @@ class GPTBot:
     parcel_api: Optional[Any] = None
     calculation_api: Optional[Any] = None
     room_ignore_list: List[str] = []  # List of rooms to ignore invites from
+    # In-process cache for room_settings reads, keyed by (room_id, setting)
+    # and invalidated on writes
+    room_settings_cache: Dict[Tuple[str, str], Optional[str]] = {}
+    # Shared aiohttp session for outbound tool requests, created on first use
+    _http_session: Optional[aiohttp.ClientSession] = None
+    # In-flight request futures for single-flight coalescing, keyed by request
+    _inflight: Dict[str, asyncio.Future] = {}
     logo: Optional[Image.Image] = None
     logo_uri: Optional[str] = None
     config: ConfigParser = ConfigParser()
@@ -167,6 +191,25 @@ class GPTBot:
     # User agent to use for HTTP requests
     USER_AGENT = "matrix-gptbot/dev (+https://kumig.it/kumitterer/matrix-gptbot)"
 
+    @staticmethod
+    def _connect_database(path: str | Path) -> sqlite3.Connection:
+        """Open the SQLite database and apply the connection pragmas.
+
+        WAL mode keeps writers from blocking readers, and NORMAL syncing
+        avoids a full fsync per transaction, which is safe in WAL mode.
+
+        Args:
+            path (str | Path): Path to the database file.
+
+        Returns:
+            sqlite3.Connection: The database connection.
+        """
+        database = sqlite3.connect(path)
+        database.execute("PRAGMA journal_mode=WAL")
+        database.execute("PRAGMA synchronous=NORMAL")
+
+        return database
+
     @classmethod
     async def from_config(cls, config: ConfigParser):
         """Create a new GPTBot instance from a config file.
@@ -188,7 +231,9 @@ class GPTBot:
             if "Database" in config and "Path" in config["Database"]
             else None
         )
-        bot.database = sqlite3.connect(bot.database_path) if bot.database_path else None
+        bot.database = (
+            cls._connect_database(bot.database_path) if bot.database_path else None
+        )
 
         # Override default values
         if "GPTBot" in config:
@@ -439,25 +484,176 @@ class GPTBot:
 
         await COMMANDS.get(command, COMMANDS[None])(room, event, self)
 
-    def room_uses_classification(self, room: MatrixRoom | str) -> bool:
-        """Check if a room uses classification.
+    def get_http_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use.
+
+        A single session lets all tools reuse the connector's keep-alive
+        pool and DNS cache instead of paying a fresh TCP/TLS handshake for
+        every outbound request.
+
+        Returns:
+            aiohttp.ClientSession: The shared session.
+        """
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    # Keep idle connections around long enough to cover
+                    # bursts of tool calls against the same host
+                    keepalive_timeout=60,
+                    resolver=aiohttp.AsyncResolver() if _HAVE_AIODNS else None,
+                ),
+                # Advertising compression cuts transferred bytes considerably
+                # for HTML/JSON; aiohttp decompresses transparently
+                headers={
+                    "Accept-Encoding": _ACCEPT_ENCODING,
+                    "User-Agent": self.USER_AGENT,
+                },
+            )
+
+        return self._http_session
+
+    async def single_flight(self, key: str, fetch) -> Any:
+        """Coalesce concurrent identical requests.
+
+        If a fetch for the same key is already in progress, await its result
+        instead of issuing a duplicate request.
 
         Args:
-            room (MatrixRoom | str): The room to check.
+            key (str): A key identifying the request.
+            fetch: A zero-argument coroutine function performing the request.
 
         Returns:
-            bool: Whether the room uses classification.
+            Any: The result of the fetch.
+        """
+        future = self._inflight.get(key)
+
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            result = await fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no one else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def db_fetchone(self, sql: str, parameters: tuple = ()) -> Optional[tuple]:
+        """Run a read query and return the first result row.
+
+        Uses Connection.execute, so sqlite3's per-connection statement cache
+        is hit instead of constructing a new cursor per query. Callers should
+        pass module-level SQL constants so the cache keys stay stable.
+
+        Args:
+            sql (str): The SQL query to run.
+            parameters (tuple, optional): Parameters for the query.
+
+        Returns:
+            Optional[tuple]: The first result row, or None if there is none.
+        """
+        return self.database.execute(sql, parameters).fetchone()
+
+    def db_execute(self, sql: str, parameters: tuple = ()) -> sqlite3.Cursor:
+        """Run a statement without constructing a separate cursor.
+
+        Does not commit - callers decide when a transaction ends.
+
+        Args:
+            sql (str): The SQL statement to run.
+            parameters (tuple, optional): Parameters for the statement.
+
+        Returns:
+            sqlite3.Cursor: The cursor the statement ran on.
+        """
+        return self.database.execute(sql, parameters)
+
+    def get_room_setting(self, room: MatrixRoom | str, setting: str) -> Optional[str]:
+        """Get a setting for a room.
+
+        Reads go through an in-process cache, so repeated lookups for the
+        same room skip SQLite entirely. Writes must go through
+        set_room_setting to keep the cache consistent.
+
+        Args:
+            room (MatrixRoom | str): The room to get the setting for.
+            setting (str): The name of the setting.
+
+        Returns:
+            Optional[str]: The raw setting value, or None if it is not set.
         """
         room_id = room.room_id if isinstance(room, MatrixRoom) else room
+        key = (room_id, setting)
+
+        try:
+            return self.room_settings_cache[key]
+        except KeyError:
+            pass
 
         with closing(self.database.cursor()) as cursor:
             cursor.execute(
                 "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room_id, "use_classification"),
+                key,
             )
             result = cursor.fetchone()
 
-        return False if not result else bool(int(result[0]))
+        value = result[0] if result else None
+
+        if len(self.room_settings_cache) >= 1024:
+            # Keep the cache bounded - dicts preserve insertion order, so
+            # this drops the oldest entry
+            del self.room_settings_cache[next(iter(self.room_settings_cache))]
+
+        self.room_settings_cache[key] = value
+
+        return value
+
+    def set_room_setting(self, room: MatrixRoom | str, setting: str, value: str):
+        """Store a setting for a room.
+
+        Performs the UPSERT and commit in a single transaction and keeps the
+        settings cache consistent with the new value.
+
+        Args:
+            room (MatrixRoom | str): The room to store the setting for.
+            setting (str): The name of the setting.
+            value (str): The value to store.
+        """
+        room_id = room.room_id if isinstance(room, MatrixRoom) else room
+
+        with closing(self.database.cursor()) as cursor:
+            cursor.execute(
+                """INSERT INTO room_settings (room_id, setting, value) VALUES (?, ?, ?)
+                ON CONFLICT (room_id, setting) DO UPDATE SET value = ?;""",
+                (room_id, setting, value, value),
+            )
+
+        self.database.commit()
+        self.room_settings_cache[(room_id, setting)] = value
+
+    def room_uses_classification(self, room: MatrixRoom | str) -> bool:
+        """Check if a room uses classification.
+
+        Args:
+            room (MatrixRoom | str): The room to check.
+
+        Returns:
+            bool: Whether the room uses classification.
+        """
+        value = self.get_room_setting(room, "use_classification")
+
+        return False if value is None else bool(int(value))
 
     async def _event_callback(self, room: MatrixRoom, event: Event):
         self.logger.log("Received event: " + str(event.event_id), "debug")
@@ -549,16 +745,9 @@ class GPTBot:
         Returns:
             bool: Whether the room uses timing.
         """
-        room_id = room.room_id
+        value = self.get_room_setting(room, "use_timing")
 
-        with closing(self.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room_id, "use_timing"),
-            )
-            result = cursor.fetchone()
-
-        return False if not result else bool(int(result[0]))
+        return False if value is None else bool(int(value))
 
     async def _response_callback(self, response: Response):
         for response_type, callback in RESPONSE_CALLBACKS.items():
@@ -827,7 +1016,7 @@ class GPTBot:
             self.matrix_client.device_id = await self._get_device_id()
 
         if not self.database:
-            self.database = sqlite3.connect(
+            self.database = self._connect_database(
                 Path(__file__).parent.parent / "database.db"
             )
 
@@ -976,16 +1165,9 @@ class GPTBot:
         Returns:
             bool: Whether the room uses STT.
         """
-        room_id = room.room_id if isinstance(room, MatrixRoom) else room
-
-        with closing(self.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room_id, "stt"),
-            )
-            result = cursor.fetchone()
+        value = self.get_room_setting(room, "stt")
 
-        return False if not result else bool(int(result[0]))
+        return False if value is None else bool(int(value))
 
     def room_uses_tts(self, room: MatrixRoom | str) -> bool:
         """Check if a room uses TTS.
@@ -996,16 +1178,9 @@ class GPTBot:
         Returns:
             bool: Whether the room uses TTS.
         """
-        room_id = room.room_id if isinstance(room, MatrixRoom) else room
-
-        with closing(self.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room_id, "tts"),
-            )
-            result = cursor.fetchone()
+        value = self.get_room_setting(room, "tts")
 
-        return False if not result else bool(int(result[0]))
+        return False if value is None else bool(int(value))
 
     def respond_to_room_messages(self, room: MatrixRoom | str) -> bool:
         """Check whether the bot should respond to all messages sent in a room.
@@ -1017,17 +1192,9 @@ class GPTBot:
             bool: Whether the bot should respond to all messages sent in the room.
         """
 
-        if isinstance(room, MatrixRoom):
-            room = room.room_id
+        value = self.get_room_setting(room, "always_reply")
 
-        with closing(self.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room, "always_reply"),
-            )
-            result = cursor.fetchone()
-
-        return True if not result else bool(int(result[0]))
+        return True if value is None else bool(int(value))
 
     async def get_room_model(self, room: MatrixRoom | str) -> str:
         """Get the model used for a room.
@@ -1039,17 +1206,9 @@ class GPTBot:
             str: The model used for the room.
         """
 
-        if isinstance(room, MatrixRoom):
-            room = room.room_id
+        value = self.get_room_setting(room, "model")
 
-        with closing(self.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room, "model"),
-            )
-            result = cursor.fetchone()
-
-        return result[0] if result else self.chat_api.chat_model
+        return value if value else self.chat_api.chat_model
 
     async def process_query(
         self, room: MatrixRoom, event: RoomMessageText, from_chat_command: bool = False
@@ -1197,21 +1356,11 @@ class GPTBot:
 
         default = self.default_system_message
 
-        if isinstance(room, str):
-            room_id = room
-        else:
-            room_id = room.room_id
-
-        with closing(self.database.cursor()) as cur:
-            cur.execute(
-                "SELECT value FROM room_settings WHERE room_id = ? AND setting = ?",
-                (room_id, "system_message"),
-            )
-            system_message = cur.fetchone()
+        system_message = self.get_room_setting(room, "system_message")
 
         complete = (
-            (default if ((not system_message) or self.force_system_message) else "")
-            + ("\n\n" + system_message[0] if system_message else "")
+            (default if ((system_message is None) or self.force_system_message) else "")
+            + ("\n\n" + system_message if system_message is not None else "")
         ).strip()
 
         return complete
@@ -1222,5 +1371,8 @@ class GPTBot:
         if self.matrix_client:
             asyncio.run(self.matrix_client.close())
 
+        if self._http_session and not self._http_session.closed:
+            asyncio.run(self._http_session.close())
+
         if self.database:
             self.database.close()
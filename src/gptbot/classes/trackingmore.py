@@ -1,8 +1,17 @@
+import asyncio
+import time
+
 import trackingmore
 
 from .logging import Logger
 
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
+
+# Carriers change on the order of weeks, tracking states on the order of
+# hours - cache both to absorb repeated lookups
+CARRIERS_CACHE_TTL: int = 86400
+SHIPMENT_CACHE_TTL: int = 300
+SHIPMENT_CACHE_MAX_ENTRIES: int = 128
 
 class TrackingMore:
     api_key: str
@@ -19,13 +28,35 @@ class TrackingMore:
         self.logger: Logger = logger or Logger()
         self.client = trackingmore.TrackingMore(self.api_key)
 
-    def lookup_parcel(self, query: str, carrier: Optional[str] = None, user: Optional[str] = None) -> Tuple[str, int]:
+        self._carriers_cache: Optional[Tuple[float, str]] = None
+        self._shipment_cache: Dict[str, Tuple[float, Any]] = {}
+
+    async def lookup_parcel(self, query: str, carrier: Optional[str] = None, user: Optional[str] = None) -> Tuple[str, int]:
         self.logger.log(f"Querying TrackingMore for {query}")
 
+        now = time.time()
+
         if query == "carriers":
-            response = "\n".join(f"* {carrier['courier_name']} - {carrier['courier_code']}" for carrier in self.client.get_carriers())
+            if self._carriers_cache and now - self._carriers_cache[0] < CARRIERS_CACHE_TTL:
+                return self._carriers_cache[1], 1
+
+            carriers = await asyncio.to_thread(self.client.get_carriers)
+            response = "\n".join(f"* {carrier['courier_name']} - {carrier['courier_code']}" for carrier in carriers)
+            self._carriers_cache = (now, response)
             return response, 1
 
-        response = self.client.track_shipment(query)
+        cached = self._shipment_cache.get(query)
+
+        if cached and now - cached[0] < SHIPMENT_CACHE_TTL:
+            return cached[1], 1
+
+        # The trackingmore client is synchronous, so keep it off the event loop
+        response = await asyncio.to_thread(self.client.track_shipment, query)
+
+        if len(self._shipment_cache) >= SHIPMENT_CACHE_MAX_ENTRIES:
+            oldest = min(self._shipment_cache, key=lambda key: self._shipment_cache[key][0])
+            del self._shipment_cache[oldest]
+
+        self._shipment_cache[query] = (now, response)
 
-        return response, 1
\ No newline at end of file
+        return response, 1
@@ -1,9 +1,11 @@
+import asyncio
+
 import wolframalpha
 import requests
 
 from .logging import Logger
 
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 
 class WolframAlpha:
     api_key: str
@@ -20,10 +22,11 @@ class WolframAlpha:
         self.logger: Logger = logger or Logger()
         self.client = wolframalpha.Client(self.api_key)
 
-    def generate_calculation_response(self, query: str, text: Optional[bool] = False, results_only: Optional[bool] = False, user: Optional[str] = None) -> Generator[str | bytes, None, None]:
+    async def generate_calculation_response(self, query: str, text: Optional[bool] = False, results_only: Optional[bool] = False, user: Optional[str] = None) -> AsyncGenerator[str | bytes, None]:
         self.logger.log(f"Querying WolframAlpha for {query}")
 
-        response: wolframalpha.Result = self.client.query(query)
+        # The wolframalpha client is synchronous, so keep it off the event loop
+        response: wolframalpha.Result = await asyncio.to_thread(self.client.query, query)
 
         if not response.success:
             yield "Could not process your query."
@@ -36,16 +39,28 @@ class WolframAlpha:
         if response.error:
             self.logger.log("Error in query to WolframAlpha: " + response.error, "error")
 
-        for pod in response.pods if not results_only else (response.results if len(list(response.results)) else response.pods):
+        pods = response.pods if not results_only else (response.results if len(list(response.results)) else response.pods)
+        pods = [(pod, list(pod.subpods)) for pod in pods]
+
+        # Start all image downloads up front so they run concurrently while
+        # the subpods are yielded in order
+        image_tasks = {
+            id(subpod): asyncio.create_task(asyncio.to_thread(requests.get, subpod.img.src))
+            for pod, subpods in pods
+            for subpod in subpods
+            if subpod.img and not text
+        }
+
+        for pod, subpods in pods:
             self.logger.log(pod.keys(), "debug")
             if pod.title:
                 yield "*" + pod.title + "*"
-            for subpod in pod.subpods:
+            for subpod in subpods:
                 self.logger.log(subpod.keys(), "debug")
                 if subpod.title:
                     yield "*" + subpod.title + "*"
                 if subpod.img and not text:
-                    image = requests.get(subpod.img.src).content
+                    image = (await image_tasks[id(subpod)]).content
                     yield image
                 elif subpod.plaintext:
-                    yield "```\n" + subpod.plaintext + "\n```"
\ No newline at end of file
+                    yield "```\n" + subpod.plaintext + "\n```"
@@ -1,31 +1,16 @@
 from importlib import import_module
+from pkgutil import iter_modules
 
 from .unknown import command_unknown
 
-COMMANDS = {}
-
-for command in [
-    "help",
-    "newroom",
-    "stats",
-    "botinfo",
-    "coin",
-    "ignoreolder",
-    "systemmessage",
-    "imagine",
-    "calculate",
-    "classify",
-    "chat",
-    "custom",
-    "privacy",
-    "roomsettings",
-    "dice",
-    "parcel",
-    "space",
-    "tts",
-]:
-    function = getattr(import_module(
-        "." + command, "gptbot.commands"), "command_" + command)
-    COMMANDS[command] = function
+# Discover the command modules in this package instead of maintaining a
+# hardcoded list - every module defines a command_<name> handler
+COMMANDS = {
+    module.name: getattr(
+        import_module("." + module.name, __package__), "command_" + module.name
+    )
+    for module in iter_modules(__path__)
+    if module.name != "unknown"
+}
 
 COMMANDS[None] = command_unknown
@@ -22,13 +22,24 @@ async def command_calculate(room: MatrixRoom, event: RoomMessageText, bot):
     if prompt:
         bot.logger.log("Querying calculation API...")
 
-        for subpod in bot.calculation_api.generate_calculation_response(prompt, text, results_only, user=room.room_id):
-            bot.logger.log("Sending subpod...")
+        subpods = [
+            subpod
+            async for subpod in bot.calculation_api.generate_calculation_response(prompt, text, results_only, user=room.room_id)
+        ]
+
+        bot.logger.log(f"Sending {len(subpods)} subpods...")
+
+        # The subpods are sequential content (headings followed by their
+        # images), so send them in order - the latency win lives in the
+        # concurrent image downloads inside the calculation API
+        for subpod in subpods:
             if isinstance(subpod, bytes):
                 await bot.send_image(room, subpod)
             else:
                 await bot.send_message(room, subpod, True)
 
+        bot.log_api_usage(event, room, f"{bot.calculation_api.api_code}-{bot.calculation_api.calculation_api}", 1)
+
         return
 
     await bot.send_message(room, "You need to provide a prompt.", True)
\ No newline at end of file
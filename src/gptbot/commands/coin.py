@@ -1,13 +1,15 @@
 from nio.events.room_events import RoomMessageText
 from nio.rooms import MatrixRoom
 
-from random import SystemRandom
+from secrets import randbits
+
+_HEADS = "Flipping a coin... It's heads!"
+_TAILS = "Flipping a coin... It's tails!"
 
 
 async def command_coin(room: MatrixRoom, event: RoomMessageText, bot):
     bot.logger.log("Flipping a coin...")
 
-    heads = SystemRandom().choice([True, False])
-    body = "Flipping a coin... It's " + ("heads!" if heads else "tails!")
+    body = _HEADS if randbits(1) else _TAILS
 
-    await bot.send_message(room, body, True)
\ No newline at end of file
+    await bot.send_message(room, body, True)
@@ -1,9 +1,7 @@
 from nio.events.room_events import RoomMessageText
 from nio.rooms import MatrixRoom
 
-
-async def command_help(room: MatrixRoom, event: RoomMessageText, bot):
-    body = """Available commands:
+_HELP_BODY = """Available commands:
 
 - !gptbot help - Show this message
 - !gptbot botinfo - Show information about the bot
@@ -23,4 +21,6 @@ async def command_help(room: MatrixRoom, event: RoomMessageText, bot):
 - !gptbot ignoreolder - Ignore messages before this point as context
 """
 
-    await bot.send_message(room, body, True)
+
+async def command_help(room: MatrixRoom, event: RoomMessageText, bot):
+    await bot.send_message(room, _HELP_BODY, True)
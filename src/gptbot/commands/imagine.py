@@ -1,3 +1,5 @@
+import asyncio
+
 from nio.events.room_events import RoomMessageText
 from nio.rooms import MatrixRoom
 
@@ -15,9 +17,10 @@ async def command_imagine(room: MatrixRoom, event: RoomMessageText, bot):
             await bot.send_message(room, "Sorry, I couldn't generate an image. Please try again later.", True)
             return
 
-        for image in images:
-            bot.logger.log("Sending image...")
-            await bot.send_image(room, image)
+        bot.logger.log(f"Sending {len(images)} images...")
+
+        # The uploads are independent, so overlap the Matrix round-trips
+        await asyncio.gather(*(bot.send_image(room, image) for image in images))
 
         bot.log_api_usage(event, room, f"{bot.image_api.api_code}-{bot.image_api.image_model}", tokens_used)
 
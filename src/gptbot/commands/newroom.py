@@ -1,8 +1,10 @@
+import asyncio
+
 from nio.events.room_events import RoomMessageText
 from nio import RoomCreateError, RoomInviteError
 from nio.rooms import MatrixRoom
 
-from contextlib import closing
+_SQL_GET_ACTIVE_SPACE = "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE"
 
 async def command_newroom(room: MatrixRoom, event: RoomMessageText, bot):
     room_name = " ".join(event.body.split()[
@@ -17,30 +19,39 @@ async def command_newroom(room: MatrixRoom, event: RoomMessageText, bot):
         return
 
     bot.logger.log(f"Inviting {event.sender} to new room...")
-    invite = await bot.matrix_client.room_invite(new_room.room_id, event.sender)
 
-    if isinstance(invite, RoomInviteError):
-        bot.logger.log(f"Failed to invite user: {invite.message}")
-        await bot.send_message(room, "Sorry, I was unable to invite you to the new room. Please try again later, or create a room manually.", True)
-        return
+    # The post-creation calls are all independent, so overlap the Matrix
+    # round-trips instead of awaiting them one by one
+    invite_task = asyncio.create_task(
+        bot.matrix_client.room_invite(new_room.room_id, event.sender))
+
+    post_tasks = [invite_task]
 
-    with closing(bot.database.cursor()) as cursor:
-        cursor.execute(
-            "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE", (event.sender,))
-        space = cursor.fetchone()
+    space = bot.db_fetchone(_SQL_GET_ACTIVE_SPACE, (event.sender,))
 
     if space:
         bot.logger.log(f"Adding new room to space {space[0]}...")
-        await bot.add_rooms_to_space(space[0], [new_room.room_id])
+        post_tasks.append(bot.add_rooms_to_space(space[0], [new_room.room_id]))
 
     if bot.logo_uri:
-        await bot.matrix_client.room_put_state(room, "m.room.avatar", {
+        post_tasks.append(bot.matrix_client.room_put_state(new_room.room_id, "m.room.avatar", {
             "url": bot.logo_uri
-        }, "")
+        }, ""))
+
+    post_tasks.append(bot.matrix_client.room_put_state(
+        new_room.room_id, "m.room.power_levels", {"users": {event.sender: 100, bot.matrix_client.user_id: 100}}))
 
-    await bot.matrix_client.room_put_state(
-        new_room.room_id, "m.room.power_levels", {"users": {event.sender: 100, bot.matrix_client.user_id: 100}})
+    await asyncio.gather(*post_tasks)
+
+    invite = invite_task.result()
+
+    if isinstance(invite, RoomInviteError):
+        bot.logger.log(f"Failed to invite user: {invite.message}")
+        await bot.send_message(room, "Sorry, I was unable to invite you to the new room. Please try again later, or create a room manually.", True)
+        return
 
-    await bot.matrix_client.joined_rooms()
-    await bot.send_message(room, f"Alright, I've created a new room called '{room_name}' and invited you to it. You can find it at {new_room.room_id}", True)
+    await asyncio.gather(
+        bot.matrix_client.joined_rooms(),
+        bot.send_message(room, f"Alright, I've created a new room called '{room_name}' and invited you to it. You can find it at {new_room.room_id}", True),
+    )
     await bot.send_message(bot.matrix_client.rooms[new_room.room_id], "Welcome to the new room! What can I do for you?")
@@ -1,3 +1,5 @@
+import asyncio
+
 from nio.events.room_events import RoomMessageText
 from nio.rooms import MatrixRoom
 
@@ -8,12 +10,16 @@ async def command_parcel(room: MatrixRoom, event: RoomMessageText, bot):
     if prompt:
         bot.logger.log("Looking up parcels...")
 
-        for parcel in prompt:
-            status, tokens_used = bot.parcel_api.lookup_parcel(parcel, user=room.room_id)
+        # The lookups are independent, so run them concurrently
+        results = await asyncio.gather(
+            *(bot.parcel_api.lookup_parcel(parcel, user=room.room_id) for parcel in prompt)
+        )
+
+        await asyncio.gather(*(bot.send_message(room, status, True) for status, _ in results))
 
-            await bot.send_message(room, status, True)
+        total_tokens = sum(tokens_used for _, tokens_used in results)
 
-            bot.log_api_usage(event, room, f"{bot.parcel_api.api_code}-{bot.parcel_api.parcel_api}", tokens_used)
-            return
+        bot.log_api_usage(event, room, f"{bot.parcel_api.api_code}-{bot.parcel_api.parcel_api}", total_tokens)
+        return
 
-    await bot.send_message(room, "You need to provide tracking numbers.", True)
\ No newline at end of file
+    await bot.send_message(room, "You need to provide tracking numbers.", True)
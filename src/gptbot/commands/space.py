@@ -1,68 +1,63 @@
+import asyncio
+
 from nio.events.room_events import RoomMessageText
 from nio.rooms import MatrixRoom
 from nio.responses import RoomInviteError
 
-from contextlib import closing
+# A user accumulates one row per enable cycle (disable flips the old row
+# to FALSE), so prefer the active row if any exists
+_SQL_GET_USER_SPACE = "SELECT space_id, active FROM user_spaces WHERE user_id = ? ORDER BY active DESC LIMIT 1"
+_SQL_INSERT_SPACE = "INSERT INTO user_spaces (space_id, user_id) VALUES (?, ?)"
+_SQL_DISABLE_SPACE = "UPDATE user_spaces SET active = FALSE WHERE user_id = ?"
 
 
 async def command_space(room: MatrixRoom, event: RoomMessageText, bot):
+    # Fetch the user's space row once - every branch below works off it
+    row = bot.db_fetchone(_SQL_GET_USER_SPACE, (event.sender,))
+    space_id, active = row if row else (None, None)
+
     if len(event.body.split()) == 3:
         request = event.body.split()[2]
 
         if request.lower() == "enable":
             bot.logger.log("Enabling space...")
 
-            with closing(bot.database.cursor()) as cursor:
-                cursor.execute(
-                    "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE", (event.sender,))
-                space = cursor.fetchone()
-
-            if not space:
-                space = await bot.create_space("GPTBot")
+            if not (space_id and active):
+                space_id = await bot.create_space("GPTBot")
                 bot.logger.log(
-                    f"Created space {space} for user {event.sender}")
+                    f"Created space {space_id} for user {event.sender}")
 
                 if bot.logo_uri:
-                    await bot.matrix_client.room_put_state(space, "m.room.avatar", {
+                    await bot.matrix_client.room_put_state(space_id, "m.room.avatar", {
                         "url": bot.logo_uri
                     }, "")
 
-                with closing(bot.database.cursor()) as cursor:
-                    cursor.execute(
-                        "INSERT INTO user_spaces (space_id, user_id) VALUES (?, ?)", (space, event.sender))
+                bot.db_execute(_SQL_INSERT_SPACE, (space_id, event.sender))
 
-            else:
-                space = space[0]
-
-            response = await bot.matrix_client.room_invite(space, event.sender)
+            response = await bot.matrix_client.room_invite(space_id, event.sender)
 
             if isinstance(response, RoomInviteError):
                 bot.logger.log(
-                    f"Failed to invite user {event.sender} to space {space}", "error")
+                    f"Failed to invite user {event.sender} to space {space_id}", "error")
                 await bot.send_message(
                     room, "Sorry, I couldn't invite you to the space. Please try again later.", True)
                 return
 
             bot.database.commit()
             await bot.send_message(room, "Space enabled.", True)
+
+            active = True
             request = "update"
 
         elif request.lower() == "disable":
             bot.logger.log("Disabling space...")
 
-            with closing(bot.database.cursor()) as cursor:
-                cursor.execute(
-                    "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE", (event.sender,))
-                space = cursor.fetchone()[0]
-
-            if not space:
+            if not (space_id and active):
                 bot.logger.log(f"User {event.sender} does not have a space")
                 await bot.send_message(room, "You don't have a space enabled.", True)
                 return
 
-            with closing(bot.database.cursor()) as cursor:
-                cursor.execute(
-                    "UPDATE user_spaces SET active = FALSE WHERE user_id = ?", (event.sender,))
+            bot.db_execute(_SQL_DISABLE_SPACE, (event.sender,))
 
             bot.database.commit()
             await bot.send_message(room, "Space disabled.", True)
@@ -71,33 +66,30 @@ async def command_space(room: MatrixRoom, event: RoomMessageText, bot):
         if request.lower() == "update":
             bot.logger.log("Updating space...")
 
-            with closing(bot.database.cursor()) as cursor:
-                cursor.execute(
-                    "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE", (event.sender,))
-                space = cursor.fetchone()[0]
-
-            if not space:
+            if not (space_id and active):
                 bot.logger.log(f"User {event.sender} does not have a space")
                 await bot.send_message(
                     room, "You don't have a space enabled. Create one first using `!gptbot space enable`.", True)
                 return
 
-            rooms = bot.matrix_client.rooms
-
-            join_rooms = []
+            join_rooms = [
+                joined_room.room_id
+                for joined_room in bot.matrix_client.rooms.values()
+                if event.sender in joined_room.users
+            ]
 
-            for room in rooms.values():
-                if event.sender in room.users.keys():
-                    bot.logger.log(
-                        f"Adding room {room.room_id} to space {space}")
-                    join_rooms.append(room.room_id)
+            bot.logger.log(
+                f"Adding {len(join_rooms)} rooms to space {space_id}")
 
-            await bot.add_rooms_to_space(space, join_rooms)
+            # The space update and the avatar are independent round-trips
+            update_tasks = [bot.add_rooms_to_space(space_id, join_rooms)]
 
             if bot.logo_uri:
-                await bot.matrix_client.room_put_state(space, "m.room.avatar", {
+                update_tasks.append(bot.matrix_client.room_put_state(space_id, "m.room.avatar", {
                     "url": bot.logo_uri
-                }, "")
+                }, ""))
+
+            await asyncio.gather(*update_tasks)
 
             await bot.send_message(room, "Space updated.", True)
             return
@@ -105,22 +97,17 @@ async def command_space(room: MatrixRoom, event: RoomMessageText, bot):
         if request.lower() == "invite":
             bot.logger.log("Inviting user to space...")
 
-            with closing(bot.database.cursor()) as cursor:
-                cursor.execute(
-                    "SELECT space_id FROM user_spaces WHERE user_id = ?", (event.sender,))
-                space = cursor.fetchone()[0]
-
-            if not space:
+            if not space_id:
                 bot.logger.log(f"User {event.sender} does not have a space")
                 await bot.send_message(
                     room, "You don't have a space enabled. Create one first using `!gptbot space enable`.", True)
                 return
 
-            response = await bot.matrix_client.room_invite(space, event.sender)
+            response = await bot.matrix_client.room_invite(space_id, event.sender)
 
             if isinstance(response, RoomInviteError):
                 bot.logger.log(
-                    f"Failed to invite user {event.sender} to space {space}", "error")
+                    f"Failed to invite user {event.sender} to space {space_id}", "error")
                 await bot.send_message(
                     room, "Sorry, I couldn't invite you to the space. Please try again later.", True)
                 return
@@ -128,17 +115,12 @@ async def command_space(room: MatrixRoom, event: RoomMessageText, bot):
             await bot.send_message(room, "Invited you to the space.", True)
             return
 
-    with closing(bot.database.cursor()) as cursor:
-        cursor.execute(
-            "SELECT active FROM user_spaces WHERE user_id = ?", (event.sender,))
-        status = cursor.fetchone()
-
-    if not status:
+    if not row:
         await bot.send_message(
             room, "You don't have a space enabled. Create one using `!gptbot space enable`.", True)
         return
 
-    if not status[0]:
+    if not active:
         await bot.send_message(
             room, "Your space is disabled. Enable it using `!gptbot space enable`.", True)
         return
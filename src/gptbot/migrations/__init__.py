@@ -3,7 +3,7 @@ from typing import Optional
 from importlib import import_module
 from sqlite3 import Connection as SQLiteConnection
 
-MAX_MIGRATION = 8
+MAX_MIGRATION = 11
 
 MIGRATIONS = OrderedDict()
 
@@ -0,0 +1,26 @@
+# Migration to add a cache table for geocoding lookups
+
+from datetime import datetime
+from contextlib import closing
+
+def migration(conn):
+    with closing(conn.cursor()) as cursor:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                key TEXT NOT NULL,
+                address TEXT NOT NULL,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                cached_at INTEGER NOT NULL,
+                PRIMARY KEY (key)
+            )
+            """
+        )
+
+        cursor.execute(
+            "INSERT INTO migrations (id, timestamp) VALUES (10, ?)",
+            (datetime.now(),)
+        )
+
+        conn.commit()
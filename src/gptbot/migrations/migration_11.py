@@ -0,0 +1,25 @@
+# Migration to add a cache table for Wikipedia lookups
+
+from datetime import datetime
+from contextlib import closing
+
+def migration(conn):
+    with closing(conn.cursor()) as cursor:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS wikipedia_cache (
+                key TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                cached_at INTEGER NOT NULL,
+                PRIMARY KEY (key)
+            )
+            """
+        )
+
+        cursor.execute(
+            "INSERT INTO migrations (id, timestamp) VALUES (11, ?)",
+            (datetime.now(),)
+        )
+
+        conn.commit()
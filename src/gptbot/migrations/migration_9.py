@@ -0,0 +1,20 @@
+# Migration to add an index on token_usage for per-room stats queries
+
+from datetime import datetime
+from contextlib import closing
+
+def migration(conn):
+    with closing(conn.cursor()) as cursor:
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_token_usage_room
+            ON token_usage (room_id)
+            """
+        )
+
+        cursor.execute(
+            "INSERT INTO migrations (id, timestamp) VALUES (9, ?)",
+            (datetime.now(),)
+        )
+
+        conn.commit()
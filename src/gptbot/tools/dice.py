@@ -2,6 +2,8 @@ from .base import BaseTool
 
 from random import SystemRandom
 
+_RNG = SystemRandom()
+
 class Dice(BaseTool):
     DESCRIPTION = "Roll dice."
     PARAMETERS = {
@@ -20,7 +22,10 @@ class Dice(BaseTool):
         """Roll dice."""
         dice = int(self.kwargs.get("dice", 6))
 
+        if dice < 1:
+            raise Exception('The dice must have at least one side.')
+
         return f"""**Dice roll**
 Used dice: {dice}
-Result: {SystemRandom().randint(1, dice)}
-"""
\ No newline at end of file
+Result: {_RNG.randint(1, dice)}
+"""
@@ -1,7 +1,41 @@
+import asyncio
+import time
+import unicodedata
+
+from functools import lru_cache
+
 from geopy.geocoders import Nominatim
 
 from .base import BaseTool
 
+# Nominatim results are stable over time, so cache them for a month
+CACHE_TTL = 30 * 86400
+
+_SQL_GET_CACHED = "SELECT address, latitude, longitude FROM geocode_cache WHERE key = ? AND cached_at > ?"
+_SQL_STORE_CACHED = "INSERT OR REPLACE INTO geocode_cache (key, address, latitude, longitude, cached_at) VALUES (?, ?, ?, ?, ?)"
+
+
+@lru_cache(maxsize=1)
+def _get_geolocator(user_agent: str) -> Nominatim:
+    """Return a shared Nominatim instance.
+
+    Reusing one geolocator lets its underlying HTTP session keep
+    connections to Nominatim alive across lookups.
+    """
+    return Nominatim(user_agent=user_agent)
+
+
+def _normalize(location: str) -> str:
+    """Normalize a location string into a stable cache key."""
+    return (
+        unicodedata.normalize("NFKD", location)
+        .encode("ascii", "ignore")
+        .decode()
+        .lower()
+        .strip()
+    )
+
+
 class Geocode(BaseTool):
     DESCRIPTION = "Get location information (latitude, longitude) for a given location name."
     PARAMETERS = {
@@ -21,14 +55,33 @@ class Geocode(BaseTool):
         if not (location := self.kwargs.get("location")):
             raise Exception('No location provided.')
 
-        geolocator = Nominatim(user_agent=self.bot.USER_AGENT)
+        key = _normalize(location)
 
-        location = geolocator.geocode(location)
+        cached = self.bot.db_fetchone(
+            _SQL_GET_CACHED, (key, int(time.time()) - CACHE_TTL))
 
-        if location:
-            return f"""**Location information for {location.address}**
-Latitude: {location.latitude}
-Longitude: {location.longitude}
-"""
+        if cached:
+            address, latitude, longitude = cached
+        else:
+            geolocator = _get_geolocator(self.bot.USER_AGENT)
+
+            # geopy's default adapter is blocking, so keep it off the event
+            # loop; concurrent lookups of the same place share one request
+            result = await self.bot.single_flight(
+                f"geocode:{key}",
+                lambda: asyncio.to_thread(geolocator.geocode, location),
+            )
 
-        raise Exception('Could not find location data for that location.')
\ No newline at end of file
+            if not result:
+                raise Exception('Could not find location data for that location.')
+
+            address, latitude, longitude = result.address, result.latitude, result.longitude
+
+            self.bot.db_execute(
+                _SQL_STORE_CACHED, (key, address, latitude, longitude, int(time.time())))
+            self.bot.database.commit()
+
+        return f"""**Location information for {address}**
+Latitude: {latitude}
+Longitude: {longitude}
+"""
@@ -2,7 +2,9 @@ from .base import BaseTool, StopProcessing
 
 from nio import RoomCreateError, RoomInviteError
 
-from contextlib import closing
+import asyncio
+
+_SQL_GET_ACTIVE_SPACE = "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE"
 
 class Newroom(BaseTool):
     DESCRIPTION = "Create a new Matrix room"
@@ -14,7 +16,7 @@ class Newroom(BaseTool):
                 "description": "The name of the room to create.",
                 "default": "GPTBot"
             }
-        },   
+        },
     }
 
     async def run(self):
@@ -22,36 +24,51 @@ class Newroom(BaseTool):
         name = self.kwargs.get("name", "GPTBot")
 
         self.bot.logger.log("Creating new room...")
-        new_room = await self.bot.matrix_client.room_create(name=name)
+
+        # Bundle the avatar and power levels into the create call itself,
+        # saving the two separate state round-trips after creation
+        initial_state = []
+
+        if self.bot.logo_uri:
+            initial_state.append({
+                "type": "m.room.avatar",
+                "state_key": "",
+                "content": {"url": self.bot.logo_uri},
+            })
+
+        new_room = await self.bot.matrix_client.room_create(
+            name=name,
+            initial_state=initial_state,
+            power_level_override={"users": {self.user: 100, self.bot.matrix_client.user_id: 100}},
+        )
 
         if isinstance(new_room, RoomCreateError):
             self.bot.logger.log(f"Failed to create room: {new_room.message}")
             raise
 
         self.bot.logger.log(f"Inviting {self.user} to new room...")
-        invite = await self.bot.matrix_client.room_invite(new_room.room_id, self.user)
 
-        if isinstance(invite, RoomInviteError):
-            self.bot.logger.log(f"Failed to invite user: {invite.message}")
-            raise
+        # The post-creation calls are all independent, so overlap the Matrix
+        # round-trips instead of awaiting them one by one
+        invite_task = asyncio.create_task(
+            self.bot.matrix_client.room_invite(new_room.room_id, self.user))
 
-        await self.bot.send_message(new_room.room_id, "Welcome to your new room! What can I do for you?")
+        post_tasks = [invite_task]
 
-        with closing(self.bot.database.cursor()) as cursor:
-            cursor.execute(
-                "SELECT space_id FROM user_spaces WHERE user_id = ? AND active = TRUE", (self.user,))
-            space = cursor.fetchone()
+        space = self.bot.db_fetchone(_SQL_GET_ACTIVE_SPACE, (self.user,))
 
         if space:
             self.bot.logger.log(f"Adding new room to space {space[0]}...")
-            await self.bot.add_rooms_to_space(space[0], [new_room.room_id])
+            post_tasks.append(self.bot.add_rooms_to_space(space[0], [new_room.room_id]))
 
-        if self.bot.logo_uri:
-            await self.bot.matrix_client.room_put_state(new_room, "m.room.avatar", {
-                "url": self.bot.logo_uri
-            }, "")
+        post_tasks.append(self.bot.send_message(new_room.room_id, "Welcome to your new room! What can I do for you?"))
+
+        await asyncio.gather(*post_tasks)
+
+        invite = invite_task.result()
 
-        await self.bot.matrix_client.room_put_state(
-            new_room.room_id, "m.room.power_levels", {"users": {self.user: 100, self.bot.matrix_client.user_id: 100}})
+        if isinstance(invite, RoomInviteError):
+            self.bot.logger.log(f"Failed to invite user: {invite.message}")
+            raise
 
-        raise StopProcessing("Created new Matrix room with ID " + new_room.room_id + " and invited user.")
\ No newline at end of file
+        raise StopProcessing("Created new Matrix room with ID " + new_room.room_id + " and invited user.")
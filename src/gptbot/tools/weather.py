@@ -1,9 +1,23 @@
-import aiohttp
+import time
 
 from datetime import datetime
+from typing import Optional
+
+from yarl import URL
 
 from .base import BaseTool
 
+# Everything except the coordinates is constant, so the base URL (with
+# API key and units already applied) is built once and reused
+_API_URL = URL("https://api.openweathermap.org/data/3.0/onecall")
+
+# Weather barely changes within a few minutes, so cache responses per
+# coordinate pair (rounded to ~1km precision) for a short while
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 128
+
+_weather_cache = {}
+
 class Weather(BaseTool):
     DESCRIPTION = "Get weather information for a given location."
     PARAMETERS = {
@@ -25,25 +39,62 @@ class Weather(BaseTool):
         "required": ["latitude", "longitude"],
     }
 
+    # Base URL with the API key applied, cached on first use so the
+    # config file isn't consulted on every call
+    _base_url: Optional[URL] = None
+
     async def run(self):
         """Get weather information for a given location."""
         if not (latitude := self.kwargs.get("latitude")) or not (longitude := self.kwargs.get("longitude")):
             raise Exception('No location provided.')
 
+        try:
+            latitude = float(latitude)
+            longitude = float(longitude)
+        except (TypeError, ValueError):
+            raise Exception('Invalid coordinates provided.')
+
         name = self.kwargs.get("name")
 
-        weather_api_key = self.bot.config.get("OpenWeatherMap", "APIKey")
+        if Weather._base_url is None:
+            weather_api_key = self.bot.config.get("OpenWeatherMap", "APIKey", fallback=None)
+
+            if not weather_api_key:
+                raise Exception('Weather API key not found.')
+
+            Weather._base_url = _API_URL.with_query(appid=weather_api_key, units="metric")
+
+        url = Weather._base_url.update_query(lat=str(latitude), lon=str(longitude))
 
-        if not weather_api_key:
-            raise Exception('Weather API key not found.')
+        cache_key = (round(latitude, 2), round(longitude, 2))
+        now = time.time()
 
-        url = f'https://api.openweathermap.org/data/3.0/onecall?lat={latitude}&lon={longitude}&appid={weather_api_key}&units=metric'
+        cached = _weather_cache.get(cache_key)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return f"""**Weather report{f" for {name}" if name else ""}**
+        if cached and now - cached[0] < CACHE_TTL:
+            data = cached[1]
+
+        else:
+            async def fetch():
+                session = self.bot.get_http_session()
+
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await response.json()
+
+                    raise Exception(f'Could not connect to weather API: {response.status} {response.reason}')
+
+            # Coalesce concurrent requests for the same coordinates into a
+            # single upstream call
+            data = await self.bot.single_flight(f"weather:{latitude},{longitude}", fetch)
+
+            if len(_weather_cache) >= CACHE_MAX_ENTRIES:
+                oldest = min(_weather_cache, key=lambda key: _weather_cache[key][0])
+                del _weather_cache[oldest]
+
+            _weather_cache[cache_key] = (now, data)
+
+        return f"""**Weather report{f" for {name}" if name else ""}**
 Current: {data['current']['temp']}°C, {data['current']['weather'][0]['description']}
 Feels like: {data['current']['feels_like']}°C
 Humidity: {data['current']['humidity']}%
@@ -54,5 +105,3 @@ Sunset: {datetime.fromtimestamp(data['current']['sunset']).strftime('%H:%M')}
 Today: {data['daily'][0]['temp']['day']}°C, {data['daily'][0]['weather'][0]['description']}, {data['daily'][0]['summary']}
 Tomorrow: {data['daily'][1]['temp']['day']}°C, {data['daily'][1]['weather'][0]['description']}, {data['daily'][1]['summary']}
 """
-                else:
-                    raise Exception(f'Could not connect to weather API: {response.status} {response.reason}')
@@ -2,10 +2,29 @@ from .base import BaseTool
 
 import aiohttp
 
+import asyncio
+
 from bs4 import BeautifulSoup
+from bs4.element import NavigableString
 
 import re
 
+# Hard limits so an oversized or slow page can't exhaust memory or hang
+# the tool call
+MAX_RESPONSE_BYTES = 2_000_000
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# lxml parses pages many times faster than the pure-Python html.parser, but
+# the tool works fine without it
+try:
+    import lxml  # noqa: F401
+
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+
+_WS_RE = re.compile(r"\s+")
+
 class Webrequest(BaseTool):
     DESCRIPTION = "Browse an external website by URL."
     PARAMETERS = {
@@ -19,22 +38,30 @@ class Webrequest(BaseTool):
         "required": ["url"],
     }
 
-    async def html_to_text(self, html):
+    def html_to_text(self, html):
         # Parse the HTML content of the response
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, _BS4_PARSER)
 
-        # Format the links within the text
-        for link in soup.find_all('a'):
-            link_text = link.get_text()
-            link_href = link.get('href')
-            new_link_text = f"{link_text} ({link_href})"
-            link.replace_with(new_link_text)
+        # Collect the text in a single traversal, formatting links inline
+        # instead of mutating the tree for every anchor
+        parts = []
 
-        # Extract the plain text content of the website
-        plain_text_content = soup.get_text()
+        for element in soup.descendants:
+            # Exact type check: Script, Stylesheet, Comment etc. are
+            # NavigableString subclasses that shouldn't appear as text
+            if type(element) is NavigableString:
+                # Text inside links is emitted by the link itself below
+                if element.find_parent('a') is None:
+                    parts.append(str(element))
+            elif element.name == 'a':
+                parts.append(f"{element.get_text()} ({element.get('href')})")
 
         # Remove extra whitespace
-        plain_text_content = re.sub('\s+', ' ', plain_text_content).strip()
+        plain_text_content = _WS_RE.sub(' ', ''.join(parts)).strip()
+
+        # Break the parse tree's internal reference cycles so the whole
+        # document can be freed now instead of waiting for a gc cycle
+        soup.decompose()
 
         # Return the formatted text content of the website
         return plain_text_content
@@ -44,14 +71,26 @@ class Webrequest(BaseTool):
         if not (url := self.kwargs.get("url")):
             raise Exception('No URL provided.')
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.text()
+        session = self.bot.get_http_session()
+
+        async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+            if response.status == 200:
+                raw = await response.content.read(MAX_RESPONSE_BYTES)
+
+                if len(raw) == MAX_RESPONSE_BYTES and not response.content.at_eof():
+                    raise Exception('Response too large.')
+
+                data = raw.decode(response.charset or 'utf-8', errors='replace')
+
+                # Parsing a large page is pure CPU work - push it to a
+                # worker thread so the event loop keeps serving other rooms
+                output = await asyncio.to_thread(self.html_to_text, data)
 
-                    output = await self.html_to_text(data)
+                # Drop the raw body and decoded HTML before building the
+                # result, so we don't hold three copies of a large page
+                del raw, data
 
-                    return f"""**Web request**
+                return f"""**Web request**
 URL: {url}
 Status: {response.status} {response.reason}
 
@@ -2,8 +2,24 @@ from .base import BaseTool
 
 import aiohttp
 
+import json
+
 from urllib.parse import quote_plus
 
+# orjson parses JSON payloads considerably faster than the stdlib json
+# module, but the tool works fine without it
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Hard limits so an oversized or slow response can't exhaust memory or
+# hang the tool call
+MAX_RESPONSE_BYTES = 2_000_000
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
 class Websearch(BaseTool):
     DESCRIPTION = "Search the web for a given query."
     PARAMETERS = {
@@ -22,16 +38,21 @@ class Websearch(BaseTool):
         if not (query := self.kwargs.get("query")):
             raise Exception('No query provided.')
 
-        query = quote_plus(query)
+        url = f'https://librey.private.coffee/api.php?q={quote_plus(query)}'
+
+        session = self.bot.get_http_session()
+
+        async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+            if response.status == 200:
+                raw = await response.content.read(MAX_RESPONSE_BYTES)
+
+                if len(raw) == MAX_RESPONSE_BYTES and not response.content.at_eof():
+                    raise Exception('Response too large.')
+
+                data = _json_loads(raw)
 
-        url = f'https://librey.private.coffee/api.php?q={query}'
+                parts = [f"**Search results for {query}**"]
+                for result in data:
+                    parts.append(f"\n{result['title']}\n{result['url']}\n{result['description']}\n")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    response_text = "**Search results for {query}**"
-                    for result in data:
-                        response_text += f"\n{result['title']}\n{result['url']}\n{result['description']}\n"
-                    
-                    return response_text
\ No newline at end of file
+                return "".join(parts)
\ No newline at end of file
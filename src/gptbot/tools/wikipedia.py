@@ -1,8 +1,34 @@
 from .base import BaseTool
 
+import aiohttp
+
+import hashlib
+import json
+import time
+
 from urllib.parse import urlencode
 
-import aiohttp
+# orjson parses large JSON payloads (like full wikitext revisions)
+# considerably faster than the stdlib json module, but the tool works
+# fine without it
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Hard limits so an oversized or slow response can't exhaust memory or
+# hang the tool call
+MAX_RESPONSE_BYTES = 2_000_000
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+# Cache the final tool output - including any extract/summarize LLM pass -
+# so repeated queries skip both the HTTP round-trip and the LLM tokens
+CACHE_TTL = 86400
+
+_SQL_GET_CACHED = "SELECT content FROM wikipedia_cache WHERE key = ? AND cached_at > ?"
+_SQL_STORE_CACHED = "INSERT OR REPLACE INTO wikipedia_cache (key, title, content, cached_at) VALUES (?, ?, ?, ?)"
 
 class Wikipedia(BaseTool):
     DESCRIPTION = "Get information from Wikipedia."
@@ -40,6 +66,16 @@ class Wikipedia(BaseTool):
         extract = self.kwargs.get("extract")
         summarize = self.kwargs.get("summarize", False)
 
+        cache_key = hashlib.blake2b(
+            f"{language}|{query}|{extract}|{summarize}".encode(), digest_size=16
+        ).hexdigest()
+
+        cached = self.bot.db_fetchone(
+            _SQL_GET_CACHED, (cache_key, int(time.time()) - CACHE_TTL))
+
+        if cached:
+            return cached[0]
+
         args = {
             "action": "query",
             "format": "json",
@@ -51,29 +87,49 @@ class Wikipedia(BaseTool):
 
         url = f'https://{language}.wikipedia.org/w/api.php?{urlencode(args)}'
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
+        session = self.bot.get_http_session()
 
-                    try:
-                        pages = data['query']['pages']
-                        page = list(pages.values())[0]
-                        content = page['revisions'][0]['*']
-                    except KeyError:
-                        raise Exception(f'No results for {query} found in Wikipedia.')
+        async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+            if response.status == 200:
+                raw = await response.content.read(MAX_RESPONSE_BYTES)
 
-                    if extract:
-                        chat_messages = [{"role": "system", "content": f"Extract the following from the provided content: {extract}"}]
-                        chat_messages.append({"role": "user", "content": content})
-                        content, _ = await self.bot.chat_api.generate_chat_response(chat_messages, room=self.room, user=self.user, allow_override=False, use_tools=False)
+                if len(raw) == MAX_RESPONSE_BYTES and not response.content.at_eof():
+                    raise Exception('Response too large.')
 
-                    if summarize:
-                        chat_messages = [{"role": "system", "content": "Summarize the following content:"}]
-                        chat_messages.append({"role": "user", "content": content})
-                        content, _ = await self.bot.chat_api.generate_chat_response(chat_messages, room=self.room, user=self.user, allow_override=False, use_tools=False)
+                data = _json_loads(raw)
 
-                    return f"**Wikipedia: {page['title']}**\n{content}"
+                try:
+                    pages = data['query']['pages']
+                    page = list(pages.values())[0]
+                    content = page['revisions'][0]['*']
+                except KeyError:
+                    raise Exception(f'No results for {query} found in Wikipedia.')
 
+                # Extraction and summarization are folded into a single
+                # LLM call when both are requested, halving the latency
+                # and the tokens spent on the full page content
+                if extract and summarize:
+                    system_message = f"Extract the following from the provided content and summarize the extracted portion: {extract}"
+                elif extract:
+                    system_message = f"Extract the following from the provided content: {extract}"
+                elif summarize:
+                    system_message = "Summarize the following content:"
                 else:
-                    raise Exception(f'Could not connect to Wikipedia API: {response.status} {response.reason}')
\ No newline at end of file
+                    system_message = None
+
+                if system_message:
+                    chat_messages = [{"role": "system", "content": system_message}]
+                    chat_messages.append({"role": "user", "content": content})
+                    content, _ = await self.bot.chat_api.generate_chat_response(chat_messages, room=self.room, user=self.user, allow_override=False, use_tools=False)
+
+                result = f"**Wikipedia: {page['title']}**\n{content}"
+
+                self.bot.db_execute(
+                    _SQL_STORE_CACHED,
+                    (cache_key, page['title'], result, int(time.time())))
+                self.bot.database.commit()
+
+                return result
+
+            else:
+                raise Exception(f'Could not connect to Wikipedia API: {response.status} {response.reason}')
\ No newline at end of file